@@ -10,6 +10,26 @@ class Coordinates(BaseModel):
     lon: float = Field(..., ge=-180, le=180, description="Longitude")
 
 
+class SeekPoint(BaseModel):
+    """Mapping from a playback position to a byte offset in an audio file."""
+
+    time: float = Field(..., ge=0, description="Playback position in seconds")
+    offset: int = Field(..., ge=0, description="Byte offset of the frame at this position")
+
+
+class AudioMetadata(BaseModel):
+    """Metadata extracted from an audio guide file."""
+
+    duration: float = Field(..., ge=0, description="Duration in seconds")
+    bitrate: int = Field(..., ge=0, description="Average bitrate in kbps")
+    size: int = Field(..., ge=0, description="File size in bytes")
+    sample_rate: int = Field(..., gt=0, description="Sample rate in Hz")
+    vbr: bool = Field(..., description="Whether the file is variable bitrate")
+    seek_table: list[SeekPoint] = Field(
+        default_factory=list, description="Seek points ordered by playback position"
+    )
+
+
 class Attraction(BaseModel):
     """Attraction model for audio guides."""
 
@@ -21,6 +41,9 @@ class Attraction(BaseModel):
     image: str = Field(..., min_length=1, description="URL to the attraction image")
     audio_url: str = Field(..., min_length=1, description="URL to the audio guide")
     order: int = Field(..., ge=1, description="Order in the route")
+    audio: AudioMetadata | None = Field(
+        default=None, description="Metadata of the audio guide file, if available"
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -97,6 +120,58 @@ class RouteListResponse(BaseModel):
     routes: list[Route] = Field(default_factory=list, description="List of routes")
 
 
+class Cluster(BaseModel):
+    """Cluster of attractions sharing a map grid cell."""
+
+    id: str = Field(..., description="Cluster identifier in the form zoom/column/row")
+    count: int = Field(..., ge=1, description="Number of attractions in the cluster")
+    coordinates: Coordinates = Field(..., description="Centroid of the clustered attractions")
+    attraction_id: str | None = Field(
+        default=None, description="ID of the attraction if the cluster holds exactly one"
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "id": "14/40779/20300",
+                "count": 3,
+                "coordinates": {"lat": 56.3265, "lon": 44.0069},
+                "attraction_id": None,
+            }
+        }
+    }
+
+
+class ClusterListResponse(BaseModel):
+    """Response model for map clusters within a bounding box."""
+
+    zoom: int = Field(..., ge=0, description="Requested zoom level")
+    clusters: list[Cluster] = Field(default_factory=list, description="List of clusters")
+
+
+class SyncResponse(BaseModel):
+    """Response model for incremental catalog synchronization."""
+
+    version: str = Field(
+        ..., description="Opaque token of the current catalog version, passed back as since"
+    )
+    full: bool = Field(
+        ..., description="Whether the response is a full snapshot replacing the client catalog"
+    )
+    attractions: list[Attraction] = Field(
+        default_factory=list, description="Attractions added or changed since the given version"
+    )
+    routes: list[Route] = Field(
+        default_factory=list, description="Routes added or changed since the given version"
+    )
+    removed_attraction_ids: list[str] = Field(
+        default_factory=list, description="IDs of attractions removed since the given version"
+    )
+    removed_route_ids: list[str] = Field(
+        default_factory=list, description="IDs of routes removed since the given version"
+    )
+
+
 class HealthResponse(BaseModel):
     """Health check response model."""
 
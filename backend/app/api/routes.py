@@ -1,23 +1,28 @@
 """API routes for the audio guide backend."""
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
 
 from app.api.models import (
     Attraction,
     AttractionListResponse,
+    ClusterListResponse,
     ErrorResponse,
     HealthResponse,
     Route,
     RouteListResponse,
+    SyncResponse,
 )
 from app.core.config import get_settings
 from app.services.audio_guide_service import AudioGuideService
+from app.services.clustering import MAX_ZOOM
 
 router = APIRouter()
 settings = get_settings()
 audio_service = AudioGuideService(
     attractions_file=settings.attractions_file,
     routes_file=settings.routes_file,
+    audio_dir=settings.audio_dir,
+    history_size=settings.sync_history_size,
 )
 
 
@@ -67,6 +72,39 @@ async def get_attraction(attraction_id: str) -> Attraction:
     return attraction
 
 
+@router.get(
+    "/clusters",
+    response_model=ClusterListResponse,
+    summary="Get attraction clusters",
+    description=(
+        "Retrieve attraction clusters within a bounding box at a given zoom level. "
+        "A box whose western edge is east of its eastern edge crosses the antimeridian."
+    ),
+    responses={
+        status.HTTP_400_BAD_REQUEST: {
+            "model": ErrorResponse,
+            "description": "Invalid bounding box",
+        },
+    },
+)
+async def get_clusters(
+    min_lat: float = Query(..., ge=-90, le=90, description="Southern edge of the bounding box"),
+    min_lon: float = Query(..., ge=-180, le=180, description="Western edge of the bounding box"),
+    max_lat: float = Query(..., ge=-90, le=90, description="Northern edge of the bounding box"),
+    max_lon: float = Query(..., ge=-180, le=180, description="Eastern edge of the bounding box"),
+    zoom: int = Query(..., ge=0, le=MAX_ZOOM, description="Map zoom level"),
+) -> ClusterListResponse:
+    """Get attraction clusters within a bounding box."""
+    if min_lat > max_lat:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bounding box southern edge must not exceed its northern edge",
+        )
+
+    clusters = await audio_service.get_clusters(min_lat, min_lon, max_lat, max_lon, zoom)
+    return ClusterListResponse(zoom=zoom, clusters=clusters)
+
+
 @router.get(
     "/routes",
     response_model=RouteListResponse,
@@ -125,3 +163,19 @@ async def get_route_attractions(route_id: str) -> AttractionListResponse:
 
     attractions = await audio_service.get_attractions_by_ids(route.attraction_ids)
     return AttractionListResponse(attractions=attractions)
+
+
+@router.get(
+    "/sync",
+    response_model=SyncResponse,
+    summary="Sync catalog changes",
+    description="Retrieve attractions and routes changed since a given catalog version",
+)
+async def sync_catalog(
+    since: str = Query(
+        "", max_length=64, description="Catalog version token the client already holds"
+    ),
+) -> SyncResponse:
+    """Get catalog changes since a version."""
+    await audio_service.refresh()
+    return await audio_service.get_changes(since)
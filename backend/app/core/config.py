@@ -39,6 +39,16 @@ class Settings(BaseSettings):
         alias="ATTRACTIONS_FILE",
     )
     routes_file: Path = Field(default=Path("data/routes.json"), alias="ROUTES_FILE")
+    audio_dir: Path = Field(default=Path("audio"), alias="AUDIO_DIR")
+
+    # Static files
+    static_cache_bytes: int = Field(default=32 * 1024 * 1024, ge=0, alias="STATIC_CACHE_BYTES")
+    static_cache_max_file_bytes: int = Field(
+        default=512 * 1024, ge=0, alias="STATIC_CACHE_MAX_FILE_BYTES"
+    )
+
+    # Sync
+    sync_history_size: int = Field(default=64, ge=1, alias="SYNC_HISTORY_SIZE")
 
     model_config = SettingsConfigDict(
         env_file=".env",
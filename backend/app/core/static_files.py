@@ -0,0 +1,277 @@
+"""Static file serving with an in-memory cache for hot assets."""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate
+from mimetypes import guess_type
+from typing import Any
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Receive, Scope, Send
+
+
+@dataclass
+class _Asset:
+    """Static file body with precomputed response headers."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    headers: dict[str, str]
+    body: bytes
+    checked_at: float
+
+
+def _parse_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single-range Range header.
+
+    Multiple ranges and malformed headers are ignored, which makes the
+    caller serve the whole file as permitted by RFC 9110.
+
+    Args:
+        range_header: Value of the Range request header
+        size: Size of the file in bytes
+
+    Returns:
+        Tuple of (start, end) with an exclusive end, or None to serve the whole file
+
+    Raises:
+        ValueError: If the range cannot be satisfied
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = (part.strip() for part in spec.partition("-"))
+    if not (first or last) or any(part and not part.isdigit() for part in (first, last)):
+        return None
+
+    if not first:
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(0, size - length), size
+
+    start = int(first)
+    end = int(last) + 1 if last else size
+    if last and end <= start:
+        return None
+    if start >= size:
+        raise ValueError("Unsatisfiable range")
+    return start, min(end, size)
+
+
+class _LoadingResponse(Response):
+    """Response that reads a small file into the cache before serving it.
+
+    The file is read in a worker thread so the event loop is never blocked
+    on disk I/O.
+    """
+
+    def __init__(self, static: "CachedStaticFiles", key: str, path: str) -> None:
+        """Initialize the response.
+
+        Args:
+            static: Static files app owning the cache
+            key: Request path of the asset
+            path: Full path to the file
+        """
+        self.static = static
+        self.key = key
+        self.path = path
+        self.background = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Load the asset and send the response for it."""
+        try:
+            asset, stat_result = await anyio.to_thread.run_sync(self.static._load_asset, self.path)
+        except OSError:
+            # The file was removed after StaticFiles looked it up.
+            raise HTTPException(status_code=404) from None
+
+        response: Response
+        if asset is None:
+            # The file grew past the cache limit after it was looked up.
+            response = FileResponse(self.path, stat_result=stat_result)
+        else:
+            self.static._store(self.key, asset)
+            response = self.static._asset_response(asset, scope)
+        await response(scope, receive, send)
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that keeps hot assets and their headers in memory.
+
+    Files up to max_file_bytes are read in a worker thread and kept in an LRU
+    cache bounded by max_cache_bytes. Cache hits are served without touching
+    the filesystem and are only re-validated against the file once
+    revalidate_after seconds have passed.
+
+    Larger files are served by Starlette's FileResponse, which handles
+    conditional and Range requests. It hands the file to the server with the
+    http.response.pathsend extension when the server supports it, which lets
+    the server use zero-copy sendfile; servers without it, such as uvicorn,
+    get the file streamed in chunks.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_cache_bytes: int = 32 * 1024 * 1024,
+        max_file_bytes: int = 512 * 1024,
+        revalidate_after: float = 1.0,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the static files app.
+
+        Args:
+            max_cache_bytes: Total size budget of cached file bodies
+            max_file_bytes: Largest file whose body is kept in memory
+            revalidate_after: Seconds after which a cached body is checked against disk
+            **kwargs: Arguments passed to StaticFiles
+        """
+        super().__init__(**kwargs)
+        self.max_cache_bytes = max_cache_bytes
+        self.max_file_bytes = max_file_bytes
+        self.revalidate_after = revalidate_after
+        self._assets: OrderedDict[str, _Asset] = OrderedDict()
+        self._cached_bytes = 0
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        """Serve fresh cache hits directly, falling back to StaticFiles."""
+        if scope["method"] in ("GET", "HEAD"):
+            asset = self._assets.get(path)
+            if asset is not None and time.monotonic() - asset.checked_at < self.revalidate_after:
+                self._assets.move_to_end(path)
+                return self._asset_response(asset, scope)
+        return await super().get_response(path, scope)
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        """Serve a file that StaticFiles looked up on disk."""
+        if status_code != 200 or stat_result.st_size > self._body_limit:
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        key = self.get_path(scope)
+        path = os.fspath(full_path)
+        asset = self._assets.get(key)
+        if (
+            asset is None
+            or asset.path != path
+            or asset.size != stat_result.st_size
+            or asset.mtime_ns != stat_result.st_mtime_ns
+        ):
+            return _LoadingResponse(self, key, path)
+
+        asset.checked_at = time.monotonic()
+        self._assets.move_to_end(key)
+        return self._asset_response(asset, scope)
+
+    @property
+    def _body_limit(self) -> int:
+        """Largest file whose body is cached."""
+        return min(self.max_file_bytes, self.max_cache_bytes)
+
+    def _load_asset(self, path: str) -> tuple[_Asset | None, os.stat_result]:
+        """Read a file and build its cache entry.
+
+        Size and modification time come from the opened file, so the headers
+        always describe the bytes that were read even if the file changed
+        after it was looked up.
+
+        Args:
+            path: Full path to the file
+
+        Returns:
+            Tuple of (asset, or None if the file is too large to cache, stat result)
+        """
+        with open(path, "rb") as f:
+            stat_result = os.fstat(f.fileno())
+            if stat_result.st_size > self._body_limit:
+                return None, stat_result
+            body = f.read()
+
+        etag_base = f"{stat_result.st_mtime}-{stat_result.st_size}"
+        headers = {
+            "content-type": guess_type(path)[0] or "application/octet-stream",
+            "content-length": str(len(body)),
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+            "etag": f'"{hashlib.md5(etag_base.encode(), usedforsecurity=False).hexdigest()}"',
+            "accept-ranges": "bytes",
+        }
+        asset = _Asset(
+            path=path,
+            size=len(body),
+            mtime_ns=stat_result.st_mtime_ns,
+            headers=headers,
+            body=body,
+            checked_at=time.monotonic(),
+        )
+        return asset, stat_result
+
+    def _store(self, key: str, asset: _Asset) -> None:
+        """Insert an asset, evicting least recently used bodies over budget.
+
+        Args:
+            key: Request path of the asset
+            asset: Asset to store
+        """
+        previous = self._assets.pop(key, None)
+        if previous is not None:
+            self._cached_bytes -= len(previous.body)
+
+        self._cached_bytes += len(asset.body)
+        while self._cached_bytes > self.max_cache_bytes and self._assets:
+            _, evicted = self._assets.popitem(last=False)
+            self._cached_bytes -= len(evicted.body)
+        self._assets[key] = asset
+
+    def _asset_response(self, asset: _Asset, scope: Scope) -> Response:
+        """Build the response for an asset, honouring conditional and Range headers.
+
+        Args:
+            asset: Asset to serve
+            scope: ASGI scope of the request
+
+        Returns:
+            304, 206, 416 or 200 response for the asset
+        """
+        request_headers = Headers(scope=scope)
+        response_headers = Headers(asset.headers)
+        if self.is_not_modified(response_headers, request_headers):
+            return NotModifiedResponse(response_headers)
+
+        headers = dict(asset.headers)
+        byte_range = None
+        range_header = request_headers.get("range")
+        if_range = request_headers.get("if-range")
+        if range_header is not None and (
+            if_range is None or if_range in (headers["etag"], headers["last-modified"])
+        ):
+            try:
+                byte_range = _parse_range(range_header, asset.size)
+            except ValueError:
+                return Response(
+                    status_code=416,
+                    headers={"content-range": f"bytes */{asset.size}"},
+                )
+
+        head = scope["method"] == "HEAD"
+        if byte_range is None:
+            return Response(b"" if head else asset.body, headers=headers)
+
+        start, end = byte_range
+        headers["content-length"] = str(end - start)
+        headers["content-range"] = f"bytes {start}-{end - 1}/{asset.size}"
+        return Response(b"" if head else asset.body[start:end], status_code=206, headers=headers)
@@ -6,11 +6,11 @@ from pathlib import Path
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
 
 from app.api.routes import router
 from app.core.config import get_settings
 from app.core.security import setup_cors, setup_security_headers
+from app.core.static_files import CachedStaticFiles
 
 settings = get_settings()
 
@@ -60,12 +60,28 @@ def create_app() -> FastAPI:
     # Mount static files directory for images
     images_path = Path(__file__).parent.parent / "images"
     if images_path.exists():
-        app.mount("/images", StaticFiles(directory=str(images_path)), name="images")
+        app.mount(
+            "/images",
+            CachedStaticFiles(
+                directory=str(images_path),
+                max_cache_bytes=settings.static_cache_bytes,
+                max_file_bytes=settings.static_cache_max_file_bytes,
+            ),
+            name="images",
+        )
 
     # Mount static files directory for audio
     audio_path = Path(__file__).parent.parent / "audio"
     if audio_path.exists():
-        app.mount("/audio", StaticFiles(directory=str(audio_path)), name="audio")
+        app.mount(
+            "/audio",
+            CachedStaticFiles(
+                directory=str(audio_path),
+                max_cache_bytes=settings.static_cache_bytes,
+                max_file_bytes=settings.static_cache_max_file_bytes,
+            ),
+            name="audio",
+        )
 
     # Add exception handlers
     @app.exception_handler(HTTPException)
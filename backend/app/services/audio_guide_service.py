@@ -1,26 +1,108 @@
 """Audio guide service for managing attractions and routes."""
 
+import hashlib
 import json
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, cast
 
-from app.api.models import Attraction, Route
+import anyio
+
+from app.api.models import Attraction, Cluster, Route, SyncResponse
+from app.services.audio_metadata import AudioMetadataExtractor
+from app.services.clustering import ClusterPyramid
+
+
+@dataclass(frozen=True)
+class _CatalogDiff:
+    """IDs of items added, changed or removed by a catalog version."""
+
+    version: int
+    base_hash: str
+    attraction_ids: frozenset[str]
+    route_ids: frozenset[str]
+
+
+def _content_hashes(items: list[Attraction] | list[Route]) -> dict[str, str]:
+    """Compute a content hash for every catalog item.
+
+    Args:
+        items: Attractions or routes to hash
+
+    Returns:
+        Dictionary mapping item IDs to their content hashes
+    """
+    return {item.id: hashlib.sha256(item.model_dump_json().encode()).hexdigest() for item in items}
+
+
+def _changed_ids(previous: dict[str, str], current: dict[str, str]) -> frozenset[str]:
+    """Get IDs of items that were added, changed or removed.
+
+    Args:
+        previous: Content hashes before the change
+        current: Content hashes after the change
+
+    Returns:
+        Set of IDs whose hashes differ between the two snapshots
+    """
+    return frozenset(
+        item_id
+        for item_id in previous.keys() | current.keys()
+        if previous.get(item_id) != current.get(item_id)
+    )
+
+
+def _mtime(path: Path) -> int | None:
+    """Get the modification time of a file, or None if it does not exist."""
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
 
 
 class AudioGuideService:
     """Service for managing audio guide data from JSON files."""
 
-    def __init__(self, attractions_file: Path, routes_file: Path) -> None:
+    def __init__(
+        self,
+        attractions_file: Path,
+        routes_file: Path,
+        audio_dir: Path | None = None,
+        history_size: int = 64,
+    ) -> None:
         """Initialize the audio guide service.
 
         Args:
             attractions_file: Path to the attractions JSON file
             routes_file: Path to the routes JSON file
+            audio_dir: Directory served under /audio, used to extract audio metadata
+            history_size: Number of catalog versions to keep diffs for
         """
         self.attractions_file = attractions_file
         self.routes_file = routes_file
+        self._audio_metadata = AudioMetadataExtractor(audio_dir) if audio_dir else None
         self._attractions_cache: list[Attraction] | None = None
         self._routes_cache: list[Route] | None = None
+        self._cluster_pyramid: ClusterPyramid | None = None
+        self._file_mtimes: dict[Path, int | None] = {}
+        self._audio_signatures: dict[str, tuple[int, int] | None] = {}
+        self._version = 1
+        self._version_hash: str | None = None
+        self._attraction_hashes: dict[str, str] | None = None
+        self._route_hashes: dict[str, str] | None = None
+        self._pending_attraction_ids: set[str] = set()
+        self._pending_route_ids: set[str] = set()
+        self._changelog: deque[_CatalogDiff] = deque(maxlen=history_size)
+
+    def _catalog_hash(self) -> str:
+        """Compute a hash of the whole catalog from its item hashes."""
+        digest = hashlib.sha256()
+        for hashes in (self._attraction_hashes or {}, self._route_hashes or {}):
+            for item_id in sorted(hashes):
+                digest.update(f"{item_id}:{hashes[item_id]};".encode())
+            digest.update(b"|")
+        return digest.hexdigest()[:16]
 
     async def _load_attractions(self) -> dict[str, Any]:
         """Load attractions from JSON file.
@@ -28,6 +110,7 @@ class AudioGuideService:
         Returns:
             Dictionary containing attractions data
         """
+        self._file_mtimes[self.attractions_file] = _mtime(self.attractions_file)
         if not self.attractions_file.exists():
             return {"attractions": []}
 
@@ -40,6 +123,7 @@ class AudioGuideService:
         Returns:
             Dictionary containing routes data
         """
+        self._file_mtimes[self.routes_file] = _mtime(self.routes_file)
         if not self.routes_file.exists():
             return {"routes": []}
 
@@ -55,9 +139,41 @@ class AudioGuideService:
         if self._attractions_cache is None:
             data = await self._load_attractions()
             attractions_data = data.get("attractions", [])
-            self._attractions_cache = [Attraction(**attraction) for attraction in attractions_data]
+            attractions = [Attraction(**attraction) for attraction in attractions_data]
+            # Audio files are read and parsed in a worker thread to keep the event loop free.
+            await anyio.to_thread.run_sync(self._attach_audio_metadata, attractions)
+            self._attractions_cache = attractions
+            self._cluster_pyramid = ClusterPyramid(attractions)
+
+            hashes = _content_hashes(attractions)
+            if self._attraction_hashes is not None:
+                self._pending_attraction_ids |= _changed_ids(self._attraction_hashes, hashes)
+            self._attraction_hashes = hashes
         return self._attractions_cache
 
+    def _attach_audio_metadata(self, attractions: list[Attraction]) -> None:
+        """Fill in audio metadata for attractions whose audio is served locally.
+
+        Args:
+            attractions: Attractions to update in place
+        """
+        self._audio_signatures = {}
+        if self._audio_metadata is None:
+            return
+        for attraction in attractions:
+            url = attraction.audio_url
+            self._audio_signatures[url] = self._audio_metadata.file_signature(url)
+            attraction.audio = self._audio_metadata.extract(url)
+
+    def _audio_changed(self) -> bool:
+        """Check whether any audio file changed since its metadata was extracted."""
+        if self._audio_metadata is None:
+            return False
+        return any(
+            self._audio_metadata.file_signature(url) != signature
+            for url, signature in self._audio_signatures.items()
+        )
+
     async def get_attraction_by_id(self, attraction_id: str) -> Attraction | None:
         """Get attraction by ID.
 
@@ -89,6 +205,31 @@ class AudioGuideService:
                 result.append(attractions_map[attr_id])
         return result
 
+    async def get_clusters(
+        self,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+        zoom: int,
+    ) -> list[Cluster]:
+        """Get attraction clusters within a bounding box.
+
+        Args:
+            min_lat: Southern edge of the bounding box
+            min_lon: Western edge of the bounding box
+            max_lat: Northern edge of the bounding box
+            max_lon: Eastern edge of the bounding box
+            zoom: Map zoom level
+
+        Returns:
+            List of clusters visible in the bounding box
+        """
+        # The pyramid is built together with the attractions cache.
+        await self.get_all_attractions()
+        pyramid = cast(ClusterPyramid, self._cluster_pyramid)
+        return pyramid.query(min_lat, min_lon, max_lat, max_lon, zoom)
+
     async def get_all_routes(self) -> list[Route]:
         """Get all routes.
 
@@ -99,6 +240,11 @@ class AudioGuideService:
             data = await self._load_routes()
             routes_data = data.get("routes", [])
             self._routes_cache = [Route(**route) for route in routes_data]
+
+            hashes = _content_hashes(self._routes_cache)
+            if self._route_hashes is not None:
+                self._pending_route_ids |= _changed_ids(self._route_hashes, hashes)
+            self._route_hashes = hashes
         return self._routes_cache
 
     async def get_route_by_id(self, route_id: str) -> Route | None:
@@ -130,7 +276,109 @@ class AudioGuideService:
             return []
         return await self.get_attractions_by_ids(route.attraction_ids)
 
+    def _commit_version(self) -> str:
+        """Fold changes loaded since the last commit into a new catalog version.
+
+        The returned token pairs the version counter with a hash of the catalog
+        content, so versions handed out by another process or before a restart
+        are recognised as foreign rather than trusted by their number alone.
+
+        Returns:
+            Token of the current catalog version
+        """
+        if self._version_hash is None:
+            self._pending_attraction_ids.clear()
+            self._pending_route_ids.clear()
+            self._version_hash = self._catalog_hash()
+        elif self._pending_attraction_ids or self._pending_route_ids:
+            self._version += 1
+            self._changelog.append(
+                _CatalogDiff(
+                    self._version,
+                    self._version_hash,
+                    frozenset(self._pending_attraction_ids),
+                    frozenset(self._pending_route_ids),
+                )
+            )
+            self._pending_attraction_ids.clear()
+            self._pending_route_ids.clear()
+            self._version_hash = self._catalog_hash()
+        return f"{self._version}-{self._version_hash}"
+
+    async def refresh(self) -> None:
+        """Drop cached data whose source files changed since it was loaded.
+
+        Attractions also depend on their audio files, whose metadata is part
+        of the attraction content and therefore of the catalog version.
+        """
+        if self._attractions_cache is not None and (
+            self._file_mtimes.get(self.attractions_file) != _mtime(self.attractions_file)
+            or await anyio.to_thread.run_sync(self._audio_changed)
+        ):
+            self._attractions_cache = None
+            self._cluster_pyramid = None
+        if self._routes_cache is not None and self._file_mtimes.get(self.routes_file) != _mtime(
+            self.routes_file
+        ):
+            self._routes_cache = None
+
+    async def get_changes(self, since: str) -> SyncResponse:
+        """Get catalog changes made after a given version.
+
+        Falls back to a full snapshot when the version token is unknown, was
+        issued for different content (e.g. by another worker or before a
+        restart), or the diffs needed to bring the client up to date are no
+        longer kept.
+
+        Args:
+            since: Catalog version token the client already holds
+
+        Returns:
+            Added and changed items plus IDs of removed items
+        """
+        attractions = await self.get_all_attractions()
+        routes = await self.get_all_routes()
+        version = self._commit_version()
+        if since == version:
+            return SyncResponse(version=version, full=False)
+
+        number, _, content_hash = since.partition("-")
+        base = next(
+            (
+                diff
+                for diff in self._changelog
+                if str(diff.version - 1) == number and diff.base_hash == content_hash
+            ),
+            None,
+        )
+        if base is None:
+            return SyncResponse(version=version, full=True, attractions=attractions, routes=routes)
+
+        attraction_ids: set[str] = set()
+        route_ids: set[str] = set()
+        for diff in self._changelog:
+            if diff.version >= base.version:
+                attraction_ids |= diff.attraction_ids
+                route_ids |= diff.route_ids
+
+        changed_attractions = [attr for attr in attractions if attr.id in attraction_ids]
+        changed_routes = [route for route in routes if route.id in route_ids]
+        return SyncResponse(
+            version=version,
+            full=False,
+            attractions=changed_attractions,
+            routes=changed_routes,
+            removed_attraction_ids=sorted(attraction_ids - {attr.id for attr in attractions}),
+            removed_route_ids=sorted(route_ids - {route.id for route in routes}),
+        )
+
     def clear_cache(self) -> None:
-        """Clear the internal cache."""
+        """Clear the internal cache.
+
+        Content hashes are kept, so the next load is diffed against the
+        previous one and the next sync bumps the catalog version if anything
+        changed.
+        """
         self._attractions_cache = None
         self._routes_cache = None
+        self._cluster_pyramid = None
@@ -0,0 +1,377 @@
+"""MP3 metadata and seek-index extraction for audio guides."""
+
+import hashlib
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.api.models import AudioMetadata, SeekPoint
+
+# Number of entries in generated seek tables, matching the Xing TOC resolution.
+SEEK_TABLE_SIZE = 100
+
+# Bitrates in kbps indexed by [version is MPEG-1][layer][bitrate index].
+_BITRATES: dict[bool, dict[int, tuple[int, ...]]] = {
+    True: {
+        1: (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+        2: (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+        3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    },
+    False: {
+        1: (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+        2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+        3: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    },
+}
+
+# Sample rates in Hz indexed by the header version bits, then the sample rate index.
+_SAMPLE_RATES: dict[int, tuple[int, int, int]] = {
+    0: (11025, 12000, 8000),  # MPEG-2.5
+    2: (22050, 24000, 16000),  # MPEG-2
+    3: (44100, 48000, 32000),  # MPEG-1
+}
+
+_XING_FRAMES = 0x1
+_XING_BYTES = 0x2
+_XING_TOC = 0x4
+
+
+@dataclass(frozen=True)
+class _FrameHeader:
+    """Decoded MPEG audio frame header."""
+
+    mpeg1: bool
+    layer: int
+    bitrate: int
+    sample_rate: int
+    mono: bool
+    samples: int
+    size: int
+
+
+def _parse_frame_header(data: bytes, offset: int) -> _FrameHeader | None:
+    """Decode the MPEG audio frame header at the given offset.
+
+    Args:
+        data: Raw file contents
+        offset: Offset of the candidate frame header
+
+    Returns:
+        Frame header if the bytes form a valid one, None otherwise
+    """
+    if offset + 4 > len(data):
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if data[offset] != 0xFF or b1 & 0xE0 != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0x3
+    layer = 4 - ((b1 >> 1) & 0x3)
+    bitrate_index = b2 >> 4
+    sample_rate_index = (b2 >> 2) & 0x3
+    if version_bits == 1 or layer == 4 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    mpeg1 = version_bits == 3
+    bitrate = _BITRATES[mpeg1][layer][bitrate_index]
+    sample_rate = _SAMPLE_RATES[version_bits][sample_rate_index]
+    padding = (b2 >> 1) & 0x1
+
+    if layer == 1:
+        samples = 384
+        size = (12 * bitrate * 1000 // sample_rate + padding) * 4
+    else:
+        samples = 1152 if mpeg1 or layer == 2 else 576
+        size = samples // 8 * bitrate * 1000 // sample_rate + padding
+
+    return _FrameHeader(
+        mpeg1=mpeg1,
+        layer=layer,
+        bitrate=bitrate,
+        sample_rate=sample_rate,
+        mono=b3 >> 6 == 3,
+        samples=samples,
+        size=size,
+    )
+
+
+def _skip_id3v2(data: bytes) -> int:
+    """Get the offset of the first byte after a leading ID3v2 tag.
+
+    Args:
+        data: Raw file contents
+
+    Returns:
+        Offset past the ID3v2 tag, or 0 if the file has none
+    """
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | data[9] & 0x7F
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _find_first_frame(data: bytes, start: int) -> tuple[int, _FrameHeader] | None:
+    """Find the first frame that is followed by another valid frame.
+
+    Requiring two consecutive headers avoids false syncs inside junk data.
+
+    Args:
+        data: Raw file contents
+        start: Offset to start searching from
+
+    Returns:
+        Tuple of (offset, header) for the first frame, or None if not found
+    """
+    offset = data.find(b"\xff", start)
+    while offset != -1:
+        header = _parse_frame_header(data, offset)
+        if header is not None:
+            following = offset + header.size
+            if following >= len(data) or _parse_frame_header(data, following) is not None:
+                return offset, header
+        offset = data.find(b"\xff", offset + 1)
+    return None
+
+
+def _scan_frames(data: bytes, start: int) -> tuple[list[int], bool]:
+    """Collect the offsets of consecutive complete frames starting at an offset.
+
+    Args:
+        data: Raw file contents
+        start: Offset of the first frame to scan
+
+    Returns:
+        Tuple of (frame offsets in file order, whether the frames use more than one bitrate)
+    """
+    offsets = []
+    bitrates = set()
+    offset = start
+    while True:
+        header = _parse_frame_header(data, offset)
+        if header is None or offset + header.size > len(data):
+            break
+        offsets.append(offset)
+        bitrates.add(header.bitrate)
+        offset += header.size
+    return offsets, len(bitrates) > 1
+
+
+def _build_seek_table(frame_offsets: list[int], frame_duration: float) -> list[SeekPoint]:
+    """Downsample scanned frame offsets into an evenly spaced seek table.
+
+    Args:
+        frame_offsets: Offsets of all audio frames
+        frame_duration: Duration of a single frame in seconds
+
+    Returns:
+        Seek table with at most SEEK_TABLE_SIZE entries
+    """
+    count = len(frame_offsets)
+    points = min(SEEK_TABLE_SIZE, count)
+    table = []
+    for i in range(points):
+        frame = i * count // points
+        table.append(SeekPoint(time=frame * frame_duration, offset=frame_offsets[frame]))
+    return table
+
+
+def _downsample(seek_table: list[SeekPoint]) -> list[SeekPoint]:
+    """Reduce a seek table to at most SEEK_TABLE_SIZE evenly spaced points.
+
+    Args:
+        seek_table: Seek points ordered by playback position
+
+    Returns:
+        Downsampled seek table
+    """
+    count = len(seek_table)
+    if count <= SEEK_TABLE_SIZE:
+        return seek_table
+    return [seek_table[i * count // SEEK_TABLE_SIZE] for i in range(SEEK_TABLE_SIZE)]
+
+
+def parse_mp3(data: bytes) -> AudioMetadata | None:
+    """Extract duration, bitrate and a seek table from MP3 data.
+
+    Xing/Info and VBRI headers are used when present; otherwise every frame is
+    walked so that the duration and seek table are exact for untagged VBR files.
+    Truncated tags are ignored in favour of the frame walk.
+
+    Args:
+        data: Raw file contents
+
+    Returns:
+        Audio metadata, or None if no MPEG audio frames were found
+    """
+    found = _find_first_frame(data, _skip_id3v2(data))
+    if found is None:
+        return None
+    first_offset, header = found
+    frame_duration = header.samples / header.sample_rate
+
+    # Xing/Info tags live right after the side information of the first frame.
+    if header.mpeg1:
+        side_info = 17 if header.mono else 32
+    else:
+        side_info = 9 if header.mono else 17
+    xing_offset = first_offset + 4 + side_info
+    vbri_offset = first_offset + 4 + 32
+
+    frames: int | None = None
+    audio_bytes = len(data) - first_offset
+    seek_table: list[SeekPoint] = []
+    vbr = False
+    tagged = False
+
+    tag = data[xing_offset : xing_offset + 4]
+    if tag in (b"Xing", b"Info") and len(data) >= xing_offset + 8:
+        vbr = tag == b"Xing"
+        tagged = True
+        (flags,) = struct.unpack_from(">I", data, xing_offset + 4)
+        cursor = xing_offset + 8
+        if flags & _XING_FRAMES and len(data) >= cursor + 4:
+            (frames,) = struct.unpack_from(">I", data, cursor)
+            cursor += 4
+        if flags & _XING_BYTES and len(data) >= cursor + 4:
+            (audio_bytes,) = struct.unpack_from(">I", data, cursor)
+            cursor += 4
+        if flags & _XING_TOC and frames and len(data) >= cursor + 100:
+            toc = data[cursor : cursor + 100]
+            duration = frames * frame_duration
+            seek_table = [
+                SeekPoint(
+                    time=duration * i / 100, offset=first_offset + toc[i] * audio_bytes // 256
+                )
+                for i in range(100)
+            ]
+    elif data[vbri_offset : vbri_offset + 4] == b"VBRI" and len(data) >= vbri_offset + 26:
+        vbr = True
+        tagged = True
+        audio_bytes, frames, entries, scale, entry_size, frames_per_entry = struct.unpack_from(
+            ">IIHHHH", data, vbri_offset + 10
+        )
+        if 1 <= entry_size <= 4:
+            cursor = vbri_offset + 26
+            entries = min(entries, (len(data) - cursor) // entry_size)
+            offset = first_offset
+            for i in range(entries):
+                seek_table.append(
+                    SeekPoint(time=i * frames_per_entry * frame_duration, offset=offset)
+                )
+                offset += int.from_bytes(data[cursor : cursor + entry_size], "big") * scale
+                cursor += entry_size
+            seek_table = _downsample(seek_table)
+
+    # Tables come from the file itself, so drop points it cannot back.
+    seek_table = [point for point in seek_table if point.offset < len(data)]
+    if not frames:
+        # A zero frame count is as good as none; the frame walk supplies it.
+        frames = None
+        seek_table = []
+
+    if frames is None or not seek_table:
+        # The tag frame carries no audio, so scanning starts after it.
+        start = first_offset + header.size if tagged else first_offset
+        frame_offsets, mixed_bitrates = _scan_frames(data, start)
+        if not frame_offsets:
+            return None
+        vbr = vbr or mixed_bitrates
+        if frames is None:
+            frames = len(frame_offsets)
+            audio_bytes = frame_offsets[-1] - start
+            last = _parse_frame_header(data, frame_offsets[-1])
+            if last is not None:
+                audio_bytes += last.size
+        seek_table = _build_seek_table(frame_offsets, frame_duration)
+
+    duration = frames * frame_duration
+    bitrate = round(audio_bytes * 8 / duration / 1000) if duration else header.bitrate
+    return AudioMetadata(
+        duration=duration,
+        bitrate=bitrate,
+        size=len(data),
+        sample_rate=header.sample_rate,
+        vbr=vbr,
+        seek_table=seek_table,
+    )
+
+
+class AudioMetadataExtractor:
+    """Extracts MP3 metadata for audio guide files, cached by content hash."""
+
+    def __init__(self, audio_dir: Path, url_prefix: str = "/audio/") -> None:
+        """Initialize the extractor.
+
+        Args:
+            audio_dir: Directory the audio URLs are served from
+            url_prefix: URL prefix under which audio_dir is mounted
+        """
+        self.audio_dir = audio_dir
+        self.url_prefix = url_prefix
+        self._cache: dict[str, AudioMetadata | None] = {}
+        self._digests: dict[Path, tuple[int, int, str]] = {}
+
+    def _resolve(self, audio_url: str) -> Path | None:
+        """Map an audio URL to a file inside the audio directory.
+
+        Args:
+            audio_url: URL of the audio guide
+
+        Returns:
+            Path to the audio file, or None if it is not served from audio_dir
+        """
+        if not audio_url.startswith(self.url_prefix):
+            return None
+        root = self.audio_dir.resolve()
+        path = (root / audio_url[len(self.url_prefix) :]).resolve()
+        if not path.is_relative_to(root) or not path.is_file():
+            return None
+        return path
+
+    def file_signature(self, audio_url: str) -> tuple[int, int] | None:
+        """Get the size and modification time of the file behind an audio URL.
+
+        Args:
+            audio_url: URL of the audio guide
+
+        Returns:
+            Tuple of (size, mtime in nanoseconds), or None if the file is missing
+        """
+        path = self._resolve(audio_url)
+        if path is None:
+            return None
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def extract(self, audio_url: str) -> AudioMetadata | None:
+        """Get metadata for an audio guide URL.
+
+        Args:
+            audio_url: URL of the audio guide
+
+        Returns:
+            Audio metadata, or None if the file is missing, unreadable or not MP3 audio
+        """
+        path = self._resolve(audio_url)
+        if path is None:
+            return None
+
+        try:
+            # Unchanged files are not re-read just to recompute their hash.
+            stat = path.stat()
+            known = self._digests.get(path)
+            if known is not None and known[:2] == (stat.st_size, stat.st_mtime_ns):
+                return self._cache[known[2]]
+            data = path.read_bytes()
+        except OSError:
+            return None
+
+        digest = hashlib.sha256(data).hexdigest()
+        self._digests[path] = (stat.st_size, stat.st_mtime_ns, digest)
+        if digest not in self._cache:
+            self._cache[digest] = parse_mp3(data)
+        return self._cache[digest]
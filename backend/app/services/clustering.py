@@ -0,0 +1,198 @@
+"""Grid-based marker clustering pyramid for map views."""
+
+import math
+from dataclasses import dataclass
+
+from app.api.models import Attraction, Cluster, Coordinates
+
+# Highest zoom level the pyramid is built for; deeper requests are clamped.
+MAX_ZOOM = 19
+
+# Grid cells per 256px map tile side, i.e. one cell covers 64x64 screen pixels.
+CELLS_PER_TILE = 4
+
+# Web Mercator is undefined at the poles, so latitudes are clamped to this value.
+MAX_MERCATOR_LAT = 85.05112878
+
+
+@dataclass
+class _Cell:
+    """Aggregated attractions falling into a single grid cell."""
+
+    count: int
+    lat_sum: float
+    lon_sum: float
+    attraction_id: str | None
+
+    def merge(self, other: "_Cell") -> None:
+        """Merge another cell into this one."""
+        self.count += other.count
+        self.lat_sum += other.lat_sum
+        self.lon_sum += other.lon_sum
+        self.attraction_id = None
+
+
+def _project(lat: float, lon: float) -> tuple[float, float]:
+    """Project coordinates into normalized Web Mercator space.
+
+    Args:
+        lat: Latitude in degrees
+        lon: Longitude in degrees
+
+    Returns:
+        Tuple of (x, y) in the range [0, 1], with y growing southwards
+    """
+    lat = max(-MAX_MERCATOR_LAT, min(MAX_MERCATOR_LAT, lat))
+    x = (lon + 180.0) / 360.0
+    sin_lat = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return x, y
+
+
+def _cell_index(lat: float, lon: float, zoom: int) -> tuple[int, int]:
+    """Get the grid cell containing the given coordinates at a zoom level.
+
+    Args:
+        lat: Latitude in degrees
+        lon: Longitude in degrees
+        zoom: Map zoom level
+
+    Returns:
+        Tuple of (column, row) cell indices
+    """
+    size = CELLS_PER_TILE << zoom
+    x, y = _project(lat, lon)
+    return min(int(x * size), size - 1), min(int(y * size), size - 1)
+
+
+class ClusterPyramid:
+    """Precomputed marker clusters for every zoom level.
+
+    Attractions are bucketed into the grid of the deepest zoom level, and each
+    coarser level is derived by merging 2x2 blocks of cells from the level
+    below it, so the whole pyramid is built in a single pass per level.
+    """
+
+    def __init__(self, attractions: list[Attraction], max_zoom: int = MAX_ZOOM) -> None:
+        """Build the cluster pyramid.
+
+        Args:
+            attractions: Attractions to cluster
+            max_zoom: Deepest zoom level to build
+        """
+        self.max_zoom = max_zoom
+        self._levels: list[dict[tuple[int, int], _Cell]] = [{} for _ in range(max_zoom + 1)]
+
+        deepest = self._levels[max_zoom]
+        for attraction in attractions:
+            coords = attraction.coordinates
+            key = _cell_index(coords.lat, coords.lon, max_zoom)
+            cell = _Cell(1, coords.lat, coords.lon, attraction.id)
+            if key in deepest:
+                deepest[key].merge(cell)
+            else:
+                deepest[key] = cell
+
+        for zoom in range(max_zoom - 1, -1, -1):
+            level = self._levels[zoom]
+            for (col, row), child in self._levels[zoom + 1].items():
+                key = (col >> 1, row >> 1)
+                if key in level:
+                    level[key].merge(child)
+                else:
+                    level[key] = _Cell(
+                        child.count, child.lat_sum, child.lon_sum, child.attraction_id
+                    )
+
+    def query(
+        self,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+        zoom: int,
+    ) -> list[Cluster]:
+        """Get clusters whose grid cells intersect a bounding box.
+
+        A box with min_lon greater than max_lon is taken to cross the
+        antimeridian and is queried as two column ranges.
+
+        Args:
+            min_lat: Southern edge of the bounding box
+            min_lon: Western edge of the bounding box
+            max_lat: Northern edge of the bounding box
+            max_lon: Eastern edge of the bounding box
+            zoom: Map zoom level, clamped to the pyramid depth
+
+        Returns:
+            List of clusters ordered by column range, then row, then column
+        """
+        zoom = max(0, min(self.max_zoom, zoom))
+        level = self._levels[zoom]
+        min_col, min_row = _cell_index(max_lat, min_lon, zoom)
+        max_col, max_row = _cell_index(min_lat, max_lon, zoom)
+
+        last_col = (CELLS_PER_TILE << zoom) - 1
+        if min_lon <= max_lon:
+            col_ranges = [(min_col, max_col)]
+        elif max_col >= min_col:
+            # Both halves share a cell, so the box wraps around the whole grid.
+            col_ranges = [(0, last_col)]
+        else:
+            col_ranges = [(min_col, last_col), (0, max_col)]
+
+        clusters = []
+        for range_min_col, range_max_col in col_ranges:
+            for col, row in self._cells_in(level, range_min_col, range_max_col, min_row, max_row):
+                cell = level[(col, row)]
+                clusters.append(
+                    Cluster(
+                        id=f"{zoom}/{col}/{row}",
+                        count=cell.count,
+                        coordinates=Coordinates(
+                            lat=cell.lat_sum / cell.count,
+                            lon=cell.lon_sum / cell.count,
+                        ),
+                        attraction_id=cell.attraction_id,
+                    )
+                )
+        return clusters
+
+    @staticmethod
+    def _cells_in(
+        level: dict[tuple[int, int], _Cell],
+        min_col: int,
+        max_col: int,
+        min_row: int,
+        max_row: int,
+    ) -> list[tuple[int, int]]:
+        """Get keys of non-empty cells within a rectangle of a level.
+
+        Probes every cell of the rectangle or scans the level, whichever is smaller.
+
+        Args:
+            level: Cells of a single zoom level
+            min_col: First column, inclusive
+            max_col: Last column, inclusive
+            min_row: First row, inclusive
+            max_row: Last row, inclusive
+
+        Returns:
+            Cell keys ordered by row, then column
+        """
+        area = (max_col - min_col + 1) * (max_row - min_row + 1)
+        if area <= len(level):
+            return [
+                (col, row)
+                for row in range(min_row, max_row + 1)
+                for col in range(min_col, max_col + 1)
+                if (col, row) in level
+            ]
+        return sorted(
+            (
+                (col, row)
+                for col, row in level
+                if min_col <= col <= max_col and min_row <= row <= max_row
+            ),
+            key=lambda key: (key[1], key[0]),
+        )
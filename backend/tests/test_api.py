@@ -40,6 +40,23 @@ async def test_get_attraction_by_id():
         assert "description" in data
 
 
+@pytest.mark.asyncio
+async def test_get_attraction_audio_metadata():
+    """Test that attractions expose metadata of their audio guide."""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/v1/attractions/nizhny-novgorod-state-bank")
+        assert response.status_code == 200
+        audio = response.json()["audio"]
+        assert audio is not None
+        assert audio["duration"] > 0
+        assert audio["bitrate"] > 0
+        assert audio["size"] > 0
+        seek_table = audio["seek_table"]
+        assert len(seek_table) > 0
+        assert seek_table == sorted(seek_table, key=lambda point: point["time"])
+        assert all(point["offset"] < audio["size"] for point in seek_table)
+
+
 @pytest.mark.asyncio
 async def test_get_attraction_not_found():
     """Test getting non-existent attraction."""
@@ -105,3 +122,138 @@ async def test_root_endpoint():
         assert "message" in data
         assert "version" in data
         assert "docs" in data
+
+
+@pytest.mark.asyncio
+async def test_get_clusters():
+    """Test getting attraction clusters for a bounding box."""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        params = {"min_lat": 56.0, "min_lon": 43.5, "max_lat": 56.6, "max_lon": 44.5}
+        attractions = (await client.get("/api/v1/attractions")).json()["attractions"]
+
+        response = await client.get("/api/v1/clusters", params={**params, "zoom": 0})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["zoom"] == 0
+        assert len(data["clusters"]) == 1
+        assert data["clusters"][0]["count"] == len(attractions)
+
+        response = await client.get("/api/v1/clusters", params={**params, "zoom": 19})
+        assert response.status_code == 200
+        clusters = response.json()["clusters"]
+        assert sum(cluster["count"] for cluster in clusters) == len(attractions)
+        assert len(clusters) > 1
+        assert all(cluster["id"].startswith("19/") for cluster in clusters)
+
+        response = await client.get("/api/v1/clusters", params={**params, "zoom": 20})
+        assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_clusters_across_antimeridian():
+    """Test getting clusters for a bounding box crossing the antimeridian."""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        attractions = (await client.get("/api/v1/attractions")).json()["attractions"]
+        for zoom in (0, 10):
+            response = await client.get(
+                "/api/v1/clusters",
+                params={
+                    "min_lat": 56.0,
+                    "min_lon": 43.5,
+                    "max_lat": 56.6,
+                    "max_lon": -170,
+                    "zoom": zoom,
+                },
+            )
+            assert response.status_code == 200
+            clusters = response.json()["clusters"]
+            assert sum(cluster["count"] for cluster in clusters) == len(attractions)
+
+        response = await client.get(
+            "/api/v1/clusters",
+            params={"min_lat": 56.0, "min_lon": 45.0, "max_lat": 56.6, "max_lon": 43.0, "zoom": 10},
+        )
+        assert response.status_code == 200
+        assert response.json()["clusters"] == []
+
+
+@pytest.mark.asyncio
+async def test_get_clusters_invalid_bbox():
+    """Test getting clusters with an inverted bounding box."""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get(
+            "/api/v1/clusters",
+            params={"min_lat": 57.0, "min_lon": 43.5, "max_lat": 56.0, "max_lon": 44.5, "zoom": 10},
+        )
+        assert response.status_code == 400
+        data = response.json()
+        assert "detail" in data
+
+
+@pytest.mark.asyncio
+async def test_sync_catalog():
+    """Test syncing the catalog from scratch and from the current version."""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/v1/sync")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["full"] is True
+        assert len(data["attractions"]) > 0
+        assert len(data["routes"]) > 0
+
+        response = await client.get("/api/v1/sync", params={"since": data["version"]})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["full"] is False
+        assert data["attractions"] == []
+        assert data["routes"] == []
+        assert data["removed_attraction_ids"] == []
+        assert data["removed_route_ids"] == []
+
+
+@pytest.mark.asyncio
+async def test_get_static_image_cached():
+    """Test serving an image with validators and conditional requests."""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        with open("images/placeholder_mem.jpg", "rb") as f:
+            content = f.read()
+
+        for _ in range(2):
+            response = await client.get("/images/placeholder_mem.jpg")
+            assert response.status_code == 200
+            assert response.content == content
+            assert response.headers["content-length"] == str(len(content))
+            assert response.headers["x-content-type-options"] == "nosniff"
+
+        response = await client.get(
+            "/images/placeholder_mem.jpg",
+            headers={"If-None-Match": response.headers["etag"]},
+        )
+        assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_get_static_audio_range():
+    """Test serving byte ranges of audio files."""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        for name in ("placeholder_mem.mp3", "generated1.mp3"):
+            with open(f"audio/{name}", "rb") as f:
+                content = f.read()
+
+            response = await client.get(f"/audio/{name}", headers={"Range": "bytes=100-199"})
+            assert response.status_code == 206
+            assert response.content == content[100:200]
+            assert response.headers["content-range"] == f"bytes 100-199/{len(content)}"
+
+            response = await client.get(f"/audio/{name}", headers={"Range": "bytes=-10"})
+            assert response.status_code == 206
+            assert response.content == content[-10:]
+
+            response = await client.get(f"/audio/{name}")
+            assert response.status_code == 200
+            assert response.content == content
+
+            response = await client.get(
+                f"/audio/{name}", headers={"Range": f"bytes={len(content)}-"}
+            )
+            assert response.status_code == 416
@@ -0,0 +1,176 @@
+"""Tests for catalog versioning and delta sync in the audio guide service."""
+
+import json
+import os
+
+import pytest
+
+from app.services.audio_guide_service import AudioGuideService
+
+
+def make_attraction(attraction_id: str, name: str) -> dict:
+    """Build attraction data with the given ID and name."""
+    return {
+        "id": attraction_id,
+        "name": name,
+        "description": "Description",
+        "address": "Address",
+        "coordinates": {"lat": 56.32, "lon": 44.0},
+        "image": "/images/placeholder.jpg",
+        "audio_url": "/audio/placeholder.mp3",
+        "order": 1,
+    }
+
+
+def make_route(route_id: str, attraction_ids: list[str]) -> dict:
+    """Build route data visiting the given attractions."""
+    return {
+        "id": route_id,
+        "name": "Route",
+        "description": "Description",
+        "attraction_ids": attraction_ids,
+        "polyline": [[56.32, 44.0], [56.33, 44.01]],
+    }
+
+
+class Catalog:
+    """Catalog JSON files in a temporary directory."""
+
+    def __init__(self, tmp_path) -> None:
+        self.attractions_file = tmp_path / "attractions.json"
+        self.routes_file = tmp_path / "routes.json"
+        self._mtime = 1_000_000_000
+
+    def write(self, attractions: list[dict], routes: list[dict]) -> None:
+        """Write both files with a fresh modification time."""
+        self.attractions_file.write_text(json.dumps({"attractions": attractions}))
+        self.routes_file.write_text(json.dumps({"routes": routes}))
+        self._mtime += 1_000_000_000
+        for path in (self.attractions_file, self.routes_file):
+            os.utime(path, ns=(self._mtime, self._mtime))
+
+    def service(self, history_size: int = 64, audio_dir=None) -> AudioGuideService:
+        """Create a service reading this catalog."""
+        return AudioGuideService(
+            self.attractions_file, self.routes_file, audio_dir=audio_dir, history_size=history_size
+        )
+
+
+@pytest.fixture
+def catalog(tmp_path) -> Catalog:
+    """Catalog with two attractions and one route."""
+    catalog = Catalog(tmp_path)
+    catalog.write(
+        [make_attraction("a", "A"), make_attraction("b", "B")],
+        [make_route("r", ["a", "b"])],
+    )
+    return catalog
+
+
+@pytest.mark.asyncio
+async def test_sync_returns_delta(catalog):
+    """Test that added, changed and removed items are reported after a refresh."""
+    service = catalog.service()
+    initial = await service.get_changes("")
+    assert initial.full is True
+    assert [attr.id for attr in initial.attractions] == ["a", "b"]
+
+    catalog.write(
+        [make_attraction("a", "A2"), make_attraction("c", "C")],
+        [make_route("r2", ["a", "c"])],
+    )
+    await service.refresh()
+    changes = await service.get_changes(initial.version)
+    assert changes.full is False
+    assert changes.version != initial.version
+    assert [attr.id for attr in changes.attractions] == ["a", "c"]
+    assert changes.attractions[0].name == "A2"
+    assert changes.removed_attraction_ids == ["b"]
+    assert [route.id for route in changes.routes] == ["r2"]
+    assert changes.removed_route_ids == ["r"]
+
+    unchanged = await service.get_changes(changes.version)
+    assert unchanged.full is False
+    assert unchanged.attractions == []
+    assert unchanged.removed_attraction_ids == []
+
+
+@pytest.mark.asyncio
+async def test_sync_without_file_change(catalog):
+    """Test that refreshing unchanged files keeps the version."""
+    service = catalog.service()
+    initial = await service.get_changes("")
+    await service.refresh()
+    assert (await service.get_changes(initial.version)).version == initial.version
+
+
+@pytest.mark.asyncio
+async def test_sync_falls_back_after_eviction(catalog):
+    """Test that a full snapshot is returned once the needed diffs are evicted."""
+    service = catalog.service(history_size=1)
+    first = await service.get_changes("")
+
+    catalog.write([make_attraction("a", "A2"), make_attraction("b", "B")], [make_route("r", ["a"])])
+    await service.refresh()
+    second = await service.get_changes(first.version)
+    assert second.full is False
+
+    catalog.write([make_attraction("a", "A3"), make_attraction("b", "B")], [make_route("r", ["a"])])
+    await service.refresh()
+    stale = await service.get_changes(first.version)
+    assert stale.full is True
+    assert len(stale.attractions) == 2
+
+    recent = await service.get_changes(second.version)
+    assert recent.full is False
+    assert [attr.name for attr in recent.attractions] == ["A3"]
+
+
+@pytest.mark.asyncio
+async def test_sync_rejects_foreign_versions(catalog):
+    """Test that versions from another process or unknown tokens get a full snapshot."""
+    service = catalog.service()
+    first = await service.get_changes("")
+    catalog.write([make_attraction("a", "B")], [make_route("r", ["a"])])
+    await service.refresh()
+    second = await service.get_changes(first.version)
+
+    # A restarted server starts counting again but holds different content.
+    catalog.write([make_attraction("a", "C")], [make_route("r", ["a"])])
+    restarted = catalog.service()
+    for since in (second.version, first.version, "2", "999-0123456789abcdef", "garbage"):
+        changes = await restarted.get_changes(since)
+        assert changes.full is True
+        assert [attr.name for attr in changes.attractions] == ["C"]
+
+    # A server holding the same content at the same version accepts the token.
+    twin = catalog.service()
+    assert (await twin.get_changes("")).version != second.version
+    same = await restarted.get_changes((await twin.get_changes("")).version)
+    assert same.full is False
+    assert same.attractions == []
+
+
+@pytest.mark.asyncio
+async def test_sync_detects_changed_audio(catalog, tmp_path):
+    """Test that replacing an audio file bumps the version and updates its metadata."""
+    audio_dir = tmp_path / "audio"
+    audio_dir.mkdir()
+    audio_file = audio_dir / "placeholder.mp3"
+    # 128 kbps MPEG-1 Layer III frames at 44.1 kHz are 417 bytes long.
+    audio_file.write_bytes((b"\xff\xfb\x90\x00" + bytes(413)) * 5)
+
+    service = catalog.service(audio_dir=audio_dir)
+    initial = await service.get_changes("")
+    assert initial.attractions[0].audio is not None
+    duration = initial.attractions[0].audio.duration
+
+    audio_file.write_bytes((b"\xff\xfb\x90\x00" + bytes(413)) * 10)
+    os.utime(audio_file, ns=(3_000_000_000, 3_000_000_000))
+    await service.refresh()
+    changes = await service.get_changes(initial.version)
+    assert changes.full is False
+    assert changes.version != initial.version
+    assert [attr.id for attr in changes.attractions] == ["a", "b"]
+    assert changes.attractions[0].audio is not None
+    assert changes.attractions[0].audio.duration == 2 * duration
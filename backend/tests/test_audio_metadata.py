@@ -0,0 +1,158 @@
+"""Tests for MP3 metadata extraction."""
+
+import struct
+
+from app.services.audio_metadata import SEEK_TABLE_SIZE, AudioMetadataExtractor, parse_mp3
+
+# MPEG-1 Layer III, 44.1 kHz, stereo, no padding: 128 kbps and 320 kbps frames.
+FRAME_128 = b"\xff\xfb\x90\x00"
+FRAME_320 = b"\xff\xfb\xe0\x00"
+FRAME_SIZES = {FRAME_128: 417, FRAME_320: 1044}
+FRAME_DURATION = 1152 / 44100
+
+# Xing/Info tags follow the 32 bytes of stereo MPEG-1 side information.
+TAG_OFFSET = 4 + 32
+
+
+def frame(header: bytes, payload: bytes = b"") -> bytes:
+    """Build a frame with the given header and payload at the tag offset."""
+    body = bytes(TAG_OFFSET - 4) + payload
+    return header + body + bytes(FRAME_SIZES[header] - 4 - len(body))
+
+
+def xing_tag(name: bytes, frames: int, audio_bytes: int, toc: bytes) -> bytes:
+    """Build a Xing/Info tag with frame count, byte count and TOC."""
+    return name + struct.pack(">III", 0x7, frames, audio_bytes) + toc
+
+
+def test_parse_cbr_with_info_tag():
+    """Test parsing a CBR file described by an Info tag."""
+    audio = [frame(FRAME_128) for _ in range(50)]
+    audio_bytes = 417 * 51
+    toc = bytes(i * 256 // 100 for i in range(100))
+    data = frame(FRAME_128, xing_tag(b"Info", 50, audio_bytes, toc)) + b"".join(audio)
+
+    metadata = parse_mp3(data)
+    assert metadata is not None
+    assert metadata.vbr is False
+    assert metadata.duration == 50 * FRAME_DURATION
+    assert metadata.size == len(data)
+    assert metadata.bitrate == round(audio_bytes * 8 / (50 * FRAME_DURATION) / 1000)
+    assert len(metadata.seek_table) == 100
+    assert metadata.seek_table[50].offset == toc[50] * audio_bytes // 256
+
+
+def test_parse_vbr_with_xing_toc():
+    """Test parsing a VBR file whose seek table comes from the Xing TOC."""
+    audio = [frame(FRAME_128) for _ in range(20)] + [frame(FRAME_320) for _ in range(20)]
+    audio_bytes = 417 * 21 + 1044 * 20
+    toc = bytes(min(255, i * 3) for i in range(100))
+    data = frame(FRAME_128, xing_tag(b"Xing", 40, audio_bytes, toc)) + b"".join(audio)
+
+    metadata = parse_mp3(data)
+    assert metadata is not None
+    assert metadata.vbr is True
+    assert metadata.duration == 40 * FRAME_DURATION
+    assert [point.offset for point in metadata.seek_table] == [
+        value * audio_bytes // 256 for value in toc
+    ]
+    assert metadata.seek_table[10].time == 40 * FRAME_DURATION * 10 / 100
+
+
+def test_parse_vbr_with_vbri_tag():
+    """Test parsing a file with a VBRI tag."""
+    audio = [frame(FRAME_128) for _ in range(10)] + [frame(FRAME_320) for _ in range(10)]
+    audio_bytes = 417 * 11 + 1044 * 10
+    entries = [417 * 5, 417 * 5, 1044 * 5, 1044 * 5]
+    vbri = (
+        b"VBRI"
+        + struct.pack(">HHH", 1, 0, 75)
+        + struct.pack(">IIHHHH", audio_bytes, 20, len(entries), 1, 2, 5)
+        + b"".join(struct.pack(">H", entry) for entry in entries)
+    )
+    data = frame(FRAME_128, vbri) + b"".join(audio)
+
+    metadata = parse_mp3(data)
+    assert metadata is not None
+    assert metadata.vbr is True
+    assert metadata.duration == 20 * FRAME_DURATION
+    assert [point.offset for point in metadata.seek_table] == [0, 2085, 4170, 9390]
+    assert metadata.seek_table[2].time == 10 * FRAME_DURATION
+
+
+def test_parse_vbri_with_oversized_table():
+    """Test that VBRI tables are capped and kept within the file."""
+    vbri = (
+        b"VBRI"
+        + struct.pack(">HHH", 1, 0, 75)
+        + struct.pack(">IIHHHH", 1000, 100, 50000, 1, 1, 1)
+        + bytes([1]) * 900
+    )
+    data = frame(FRAME_320, vbri) + frame(FRAME_128)
+
+    metadata = parse_mp3(data)
+    assert metadata is not None
+    assert 0 < len(metadata.seek_table) <= SEEK_TABLE_SIZE
+    assert all(point.offset < len(data) for point in metadata.seek_table)
+
+
+def test_parse_truncated_input():
+    """Test that truncated files do not raise."""
+    data = frame(FRAME_128, xing_tag(b"Xing", 10, 4170, bytes(100)))
+    assert parse_mp3(data[:42]) is None
+    assert parse_mp3(data[: TAG_OFFSET + 10]) is None
+
+    metadata = parse_mp3(data + frame(FRAME_128) + frame(FRAME_128)[:100])
+    assert metadata is not None
+    assert metadata.duration == 10 * FRAME_DURATION
+
+    assert parse_mp3(b"") is None
+    assert parse_mp3(b"ID3\x04\x00\x00\x7f\x7f\x7f\x7f") is None
+
+
+def test_extractor_caches_by_content(tmp_path):
+    """Test that identical files share cached metadata and bad files yield None."""
+    data = b"".join(frame(FRAME_128) for _ in range(5))
+    (tmp_path / "a.mp3").write_bytes(data)
+    (tmp_path / "b.mp3").write_bytes(data)
+    (tmp_path / "bad.mp3").write_bytes(b"\xff\xfb\x90\x00" + bytes(32) + b"Xing\x00\x00")
+
+    extractor = AudioMetadataExtractor(tmp_path)
+    metadata = extractor.extract("/audio/a.mp3")
+    assert metadata is not None
+    assert metadata.duration == 5 * FRAME_DURATION
+    assert extractor.extract("/audio/a.mp3") is metadata
+    assert extractor.extract("/audio/b.mp3") is metadata
+
+    assert extractor.extract("/audio/bad.mp3") is None
+    assert extractor.extract("/audio/missing.mp3") is None
+    assert extractor.extract("/audio/../a.mp3") is None
+    assert extractor.extract("/images/a.mp3") is None
+
+
+def test_parse_untagged_vbr():
+    """Test that an untagged file mixing bitrates is reported as VBR."""
+    headers = [bytes([0xFF, 0xFB, index << 4, 0x00]) for index in (5, 9, 14)]
+    data = b""
+    for i in range(30):
+        header = headers[i % 3]
+        size = 144 * (64, 128, 320)[i % 3] * 1000 // 44100
+        data += header + bytes(size - 4)
+
+    metadata = parse_mp3(data)
+    assert metadata is not None
+    assert metadata.vbr is True
+    assert metadata.duration == 30 * FRAME_DURATION
+
+
+def test_parse_xing_with_zero_frame_count():
+    """Test that a zero Xing frame count falls back to walking the frames."""
+    toc = bytes(i * 256 // 100 for i in range(100))
+    audio = b"".join(frame(FRAME_128) for _ in range(100))
+    data = frame(FRAME_128, xing_tag(b"Xing", 0, len(audio), toc)) + audio
+
+    metadata = parse_mp3(data)
+    assert metadata is not None
+    assert metadata.duration == 100 * FRAME_DURATION
+    assert metadata.bitrate == 128
+    assert metadata.seek_table[1].offset == 417 * 2
@@ -0,0 +1,71 @@
+"""Tests for the marker clustering pyramid."""
+
+import pytest
+
+from app.api.models import Attraction
+from app.services.clustering import MAX_ZOOM, ClusterPyramid, _Cell, _cell_index
+
+
+def make_attraction(attraction_id: str, lat: float, lon: float) -> Attraction:
+    """Build an attraction at the given coordinates."""
+    return Attraction(
+        id=attraction_id,
+        name="Name",
+        description="Description",
+        address="Address",
+        coordinates={"lat": lat, "lon": lon},
+        image="/images/placeholder.jpg",
+        audio_url="/audio/placeholder.mp3",
+        order=1,
+    )
+
+
+ATTRACTIONS = [
+    make_attraction("a", 56.3200, 44.0000),
+    make_attraction("b", 56.3210, 44.0020),
+    make_attraction("c", 56.3400, 43.9500),
+    make_attraction("far", -33.8568, 151.2153),
+]
+
+
+def test_clusters_merge_with_centroid():
+    """Test that coarse levels merge attractions and report their centroid."""
+    pyramid = ClusterPyramid(ATTRACTIONS)
+
+    clusters = pyramid.query(56.0, 43.5, 56.6, 44.5, 0)
+    assert len(clusters) == 1
+    cluster = clusters[0]
+    assert cluster.id.startswith("0/")
+    assert cluster.count == 3
+    assert cluster.attraction_id is None
+    assert cluster.coordinates.lat == pytest.approx((56.3200 + 56.3210 + 56.3400) / 3)
+    assert cluster.coordinates.lon == pytest.approx((44.0000 + 44.0020 + 43.9500) / 3)
+
+    world = pyramid.query(-85, -180, 85, 180, 0)
+    assert sum(cluster.count for cluster in world) == len(ATTRACTIONS)
+
+
+def test_single_attraction_clusters_carry_id():
+    """Test that clusters holding one attraction expose its ID and coordinates."""
+    pyramid = ClusterPyramid(ATTRACTIONS)
+
+    clusters = pyramid.query(56.0, 43.5, 56.6, 44.5, MAX_ZOOM)
+    assert sorted(cluster.attraction_id for cluster in clusters) == ["a", "b", "c"]
+    assert all(cluster.count == 1 for cluster in clusters)
+    single = next(cluster for cluster in clusters if cluster.attraction_id == "c")
+    assert (single.coordinates.lat, single.coordinates.lon) == (56.3400, 43.9500)
+
+    col, row = _cell_index(56.3400, 43.9500, MAX_ZOOM)
+    assert single.id == f"{MAX_ZOOM}/{col}/{row}"
+
+
+def test_cells_in_probe_and_scan_agree():
+    """Test that probing a rectangle and scanning a level select the same cells."""
+    inside = {(5, 7): _Cell(1, 0, 0, "a"), (6, 6): _Cell(1, 0, 0, "b")}
+    outside = {(100, 100): _Cell(1, 0, 0, "x"), (0, 0): _Cell(1, 0, 0, "y")}
+    outside[(50, 2)] = _Cell(1, 0, 0, "z")
+
+    # A 2x2 rectangle over two cells is scanned; with five cells it is probed.
+    scanned = ClusterPyramid._cells_in(inside, 5, 6, 6, 7)
+    probed = ClusterPyramid._cells_in({**inside, **outside}, 5, 6, 6, 7)
+    assert scanned == probed == [(6, 6), (5, 7)]
@@ -0,0 +1,129 @@
+"""Tests for cached static file serving."""
+
+import os
+
+import pytest
+from httpx import AsyncClient
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from app.core.static_files import CachedStaticFiles
+
+
+@pytest.mark.asyncio
+async def test_replaced_file_on_disk(tmp_path):
+    """Test that a file replaced in place is served with matching headers."""
+    path = tmp_path / "track.mp3"
+    path.write_bytes(b"a" * 1000)
+    static = CachedStaticFiles(directory=str(tmp_path), max_file_bytes=0, revalidate_after=60)
+    app = Starlette(routes=[Mount("/audio", static)])
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/audio/track.mp3", headers={"Range": "bytes=0-99"})
+        assert response.status_code == 206
+        assert response.content == b"a" * 100
+
+        path.write_bytes(b"b" * 300)
+        os.utime(path, ns=(10**18, 10**18))
+
+        response = await client.get("/audio/track.mp3")
+        assert response.status_code == 200
+        assert response.headers["content-length"] == "300"
+        assert response.content == b"b" * 300
+
+
+@pytest.mark.asyncio
+async def test_cached_body_revalidated(tmp_path):
+    """Test that cached bodies are served from memory until revalidated."""
+    path = tmp_path / "image.jpg"
+    path.write_bytes(b"a" * 100)
+    static = CachedStaticFiles(directory=str(tmp_path), revalidate_after=60)
+    app = Starlette(routes=[Mount("/images", static)])
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        assert (await client.get("/images/image.jpg")).content == b"a" * 100
+
+        path.write_bytes(b"b" * 50)
+        os.utime(path, ns=(10**18, 10**18))
+        assert (await client.get("/images/image.jpg")).content == b"a" * 100
+
+        static.revalidate_after = 0
+        response = await client.get("/images/image.jpg")
+        assert response.headers["content-length"] == "50"
+        assert response.content == b"b" * 50
+
+
+@pytest.mark.asyncio
+async def test_cache_stays_within_budget(tmp_path):
+    """Test that least recently used bodies are evicted to stay within the budget."""
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.jpg").write_bytes(name.encode() * 100)
+    static = CachedStaticFiles(directory=str(tmp_path), max_cache_bytes=250)
+    app = Starlette(routes=[Mount("/images", static)])
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        for name in ("a", "b", "c"):
+            assert (await client.get(f"/images/{name}.jpg")).content == name.encode() * 100
+            assert static._cached_bytes <= 250
+        assert list(static._assets) == ["b.jpg", "c.jpg"]
+
+        await client.get("/images/b.jpg")
+        await client.get("/images/a.jpg")
+        assert list(static._assets) == ["b.jpg", "a.jpg"]
+        assert static._cached_bytes == 200
+
+
+@pytest.mark.asyncio
+async def test_file_changed_after_lookup(tmp_path):
+    """Test that headers describe the bytes read when a file changes after lookup."""
+    static = CachedStaticFiles(directory=str(tmp_path), max_file_bytes=1000)
+
+    async def serve(name: str, content: bytes) -> tuple[dict, bytes]:
+        """Look up a 100-byte file, replace it with content, then send the response."""
+        path = tmp_path / name
+        path.write_bytes(b"a" * 100)
+        scope = {
+            "type": "http",
+            "asgi": {"spec_version": "2.4"},
+            "method": "GET",
+            "path": f"/{name}",
+            "root_path": "",
+            "headers": [],
+        }
+        full_path, stat_result = static.lookup_path(name)
+        response = static.file_response(full_path, stat_result, scope)
+        path.write_bytes(content)
+        messages = []
+
+        async def send(message: dict) -> None:
+            messages.append(message)
+
+        await response(scope, None, send)
+        headers = {key.decode(): value.decode() for key, value in messages[0]["headers"]}
+        return headers, b"".join(message.get("body", b"") for message in messages[1:])
+
+    headers, body = await serve("small.jpg", b"b" * 50)
+    assert body == b"b" * 50
+    assert headers["content-length"] == "50"
+    assert static._cached_bytes == 50
+
+    # A file that grew past the cache limit is served from disk instead.
+    headers, body = await serve("large.jpg", b"c" * 2000)
+    assert body == b"c" * 2000
+    assert headers["content-length"] == "2000"
+    assert static._cached_bytes == 50
+
+
+@pytest.mark.asyncio
+async def test_multiple_ranges_on_large_file(tmp_path):
+    """Test that uncached files support multipart range responses."""
+    (tmp_path / "track.mp3").write_bytes(bytes(range(256)) * 4)
+    static = CachedStaticFiles(directory=str(tmp_path), max_file_bytes=0)
+    app = Starlette(routes=[Mount("/audio", static)])
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/audio/track.mp3", headers={"Range": "bytes=0-9,20-29"})
+        assert response.status_code == 206
+        assert response.headers["content-type"].startswith("multipart/byteranges")
+        assert bytes(range(10)) in response.content
+        assert bytes(range(20, 30)) in response.content
@@ -1,10 +1,14 @@
 import type {
   Attraction,
   AttractionListResponse,
+  BoundingBox,
+  Cluster,
+  ClusterListResponse,
   ErrorResponse,
   HealthResponse,
   Route,
   RouteListResponse,
+  SyncResponse,
 } from '../types';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api/v1';
@@ -61,6 +65,19 @@ export const api = {
     return handleResponse<Attraction>(response);
   },
 
+  async getClusters(bbox: BoundingBox, zoom: number): Promise<Cluster[]> {
+    const params = new URLSearchParams({
+      min_lat: String(bbox.minLat),
+      min_lon: String(bbox.minLon),
+      max_lat: String(bbox.maxLat),
+      max_lon: String(bbox.maxLon),
+      zoom: String(Math.round(zoom)),
+    });
+    const response = await fetch(`${API_URL}/clusters?${params}`);
+    const data = await handleResponse<ClusterListResponse>(response);
+    return data.clusters;
+  },
+
   async getRoutes(): Promise<Route[]> {
     const response = await fetch(`${API_URL}/routes`);
     const data = await handleResponse<RouteListResponse>(response);
@@ -77,6 +94,11 @@ export const api = {
     const data = await handleResponse<AttractionListResponse>(response);
     return data.attractions;
   },
+
+  async sync(since: string = ''): Promise<SyncResponse> {
+    const response = await fetch(`${API_URL}/sync?since=${encodeURIComponent(since)}`);
+    return handleResponse<SyncResponse>(response);
+  },
 };
 
 export { ApiError };
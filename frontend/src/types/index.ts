@@ -3,6 +3,20 @@ export interface Coordinates {
   lon: number;
 }
 
+export interface SeekPoint {
+  time: number;
+  offset: number;
+}
+
+export interface AudioMetadata {
+  duration: number;
+  bitrate: number;
+  size: number;
+  sample_rate: number;
+  vbr: boolean;
+  seek_table: SeekPoint[];
+}
+
 export interface Attraction {
   id: string;
   name: string;
@@ -12,6 +26,7 @@ export interface Attraction {
   image: string;
   audio_url: string;
   order: number;
+  audio?: AudioMetadata | null;
 }
 
 export interface Route {
@@ -30,6 +45,34 @@ export interface RouteListResponse {
   routes: Route[];
 }
 
+export interface Cluster {
+  id: string;
+  count: number;
+  coordinates: Coordinates;
+  attraction_id: string | null;
+}
+
+export interface ClusterListResponse {
+  zoom: number;
+  clusters: Cluster[];
+}
+
+export interface BoundingBox {
+  minLat: number;
+  minLon: number;
+  maxLat: number;
+  maxLon: number;
+}
+
+export interface SyncResponse {
+  version: string;
+  full: boolean;
+  attractions: Attraction[];
+  routes: Route[];
+  removed_attraction_ids: string[];
+  removed_route_ids: string[];
+}
+
 export interface HealthResponse {
   status: string;
   version: string;